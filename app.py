@@ -1,10 +1,25 @@
+import logging
 from flask import Flask
 from flask_cors import CORS
+from config import LOG_LEVEL
 from routes import register_routes
+import compression
+import metrics
+
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
 
 app = Flask(__name__)
 CORS(app)
 
+# Compact UTF-8 JSON: debug mode pretty-prints by default and ensure_ascii escapes every Korean character
+app.json.compact = True
+app.json.ensure_ascii = False
+app.json.sort_keys = False
+
+# after_request hooks run in reverse order: metrics (profile field) must run before compression
+compression.init_app(app)
+metrics.init_app(app)
+
 # Register all routes
 register_routes(app)
 
@@ -0,0 +1,394 @@
+"""
+로컬 Upstream Mock 서버
+
+data.go.kr(물품보관함), ODsay, Naver Directions, OpenAI(chat/embeddings)를
+하나의 Flask 앱으로 흉내 냅니다. 응답 지연(latency)을 설정할 수 있고,
+upstream 별 호출 횟수를 집계하여 벤치마크에서 사용합니다.
+
+`--fixtures` 디렉터리에 녹화된 응답(record_fixtures.py 로 생성)이 있으면
+그 파일을 그대로 재생하고, 없으면 요청 파라미터 기반의 합성 응답을 만듭니다.
+
+단독 실행:
+    python -m bench.mock_upstream --port 5055 --latency-ms 50 --latency openai=800
+앱 실행 시 아래 환경변수로 mock 서버를 가리키면 됩니다 (`env_for()` 참고).
+"""
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import threading
+import time
+from collections import Counter
+
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+
+# upstream 이름 -> 녹화 파일명 (fixtures 디렉터리 기준)
+FIXTURE_FILES = {
+    'locker_info': 'locker_info.json',
+    'locker_realtime_use': 'locker_realtime_use.json',
+    'searchPubTransPath': 'searchPubTransPath.json',
+    'loadLane': 'loadLane.json',
+    'driving': 'driving.json',
+}
+
+# 지연 설정 그룹: 같은 서비스의 엔드포인트는 같은 지연을 공유
+LATENCY_GROUPS = {
+    'locker_info': 'locker',
+    'locker_realtime_use': 'locker',
+    'searchPubTransPath': 'odsay',
+    'loadLane': 'odsay',
+    'driving': 'naver',
+    'chat_completions': 'openai',
+    'embeddings': 'openai',
+}
+
+EMBEDDING_DIM = 1536  # text-embedding-3-small
+
+
+class MockUpstream:
+    """mock 서버 상태(지연 설정, 호출 카운터, 녹화 응답)를 보관합니다."""
+
+    def __init__(self, latency_ms=0.0, latency_overrides=None, fixtures_dir=None, locker_count=300):
+        self.latency_ms = latency_ms
+        self.latency_overrides = dict(latency_overrides or {})
+        self.locker_count = locker_count
+        self.fixtures = self._load_fixtures(fixtures_dir)
+        self._calls = Counter()
+        self._lock = threading.Lock()
+        self.app = self._build_app()
+        self._server = None
+        self._thread = None
+
+    # --- 상태 ---
+
+    @staticmethod
+    def _load_fixtures(fixtures_dir):
+        fixtures = {}
+        if not fixtures_dir:
+            return fixtures
+        for name, filename in FIXTURE_FILES.items():
+            path = os.path.join(fixtures_dir, filename)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    fixtures[name] = json.load(f)
+        return fixtures
+
+    def counts(self):
+        with self._lock:
+            return dict(self._calls)
+
+    def reset(self):
+        with self._lock:
+            self._calls.clear()
+
+    def _hit(self, name):
+        """호출 횟수를 기록하고 설정된 지연만큼 대기합니다."""
+        with self._lock:
+            self._calls[name] += 1
+        group = LATENCY_GROUPS.get(name)
+        delay = self.latency_overrides.get(name, self.latency_overrides.get(group, self.latency_ms))
+        if delay:
+            time.sleep(delay / 1000.0)
+
+    # --- 서버 실행 ---
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self, port=0):
+        """백그라운드 스레드에서 멀티스레드 서버를 띄웁니다 (port=0이면 임의 포트)."""
+        self._server = make_server('127.0.0.1', port, self.app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
+    # --- 라우트 ---
+
+    def _build_app(self):
+        app = Flask(__name__)
+
+        @app.route('/psl/<name>')
+        def locker_api(name):
+            if name not in ('locker_info', 'locker_realtime_use'):
+                return jsonify({'header': {'resultCode': 'K4', 'resultMsg': 'NOT FOUND'}}), 404
+            self._hit(name)
+            if name in self.fixtures:
+                return jsonify(self.fixtures[name])
+            return jsonify(synth_locker_response(name, self.locker_count))
+
+        @app.route('/odsay/searchPubTransPath')
+        def odsay_search():
+            self._hit('searchPubTransPath')
+            if 'searchPubTransPath' in self.fixtures:
+                return jsonify(self.fixtures['searchPubTransPath'])
+            args = request.args
+            return jsonify(synth_pub_trans_path(
+                float(args.get('SX', 126.97)), float(args.get('SY', 37.55)),
+                float(args.get('EX', 127.02)), float(args.get('EY', 37.52))))
+
+        @app.route('/odsay/loadLane')
+        def odsay_lane():
+            self._hit('loadLane')
+            if 'loadLane' in self.fixtures:
+                return jsonify(self.fixtures['loadLane'])
+            return jsonify(synth_load_lane(request.args.get('mapObject', '')))
+
+        @app.route('/naver/driving')
+        def naver_driving():
+            self._hit('driving')
+            if 'driving' in self.fixtures:
+                return jsonify(self.fixtures['driving'])
+            start = [float(v) for v in request.args.get('start', '126.97,37.55').split(',')]
+            goal = [float(v) for v in request.args.get('goal', '127.02,37.52').split(',')]
+            return jsonify(synth_driving(start, goal))
+
+        @app.route('/openai/chat/completions', methods=['POST'])
+        def openai_chat():
+            self._hit('chat_completions')
+            return jsonify(synth_chat_completion(request.get_json(force=True)))
+
+        @app.route('/openai/embeddings', methods=['POST'])
+        def openai_embeddings():
+            self._hit('embeddings')
+            return jsonify(synth_embeddings(request.get_json(force=True)))
+
+        @app.route('/_mock/stats')
+        def stats():
+            return jsonify(self.counts())
+
+        @app.route('/_mock/reset', methods=['POST'])
+        def reset():
+            self.reset()
+            return jsonify({'success': True})
+
+        return app
+
+
+def env_for(base_url):
+    """앱(config.py)이 mock 서버를 바라보도록 하는 환경변수 묶음."""
+    return {
+        'LOCKER_BASE_URL': f'{base_url}/psl',
+        'ODSAY_BASE_URL': f'{base_url}/odsay',
+        'NAVER_DIRECTIONS_URL': f'{base_url}/naver/driving',
+        'OPENAI_BASE_URL': f'{base_url}/openai',
+        # 키가 비어 있으면 services.py가 upstream 호출을 건너뛰므로 더미 키 설정
+        'SERVICE_KEY': 'bench',
+        'ODSAY_API_KEY': 'bench',
+        'NAVER_MAP_KEY': 'bench',
+        'NAVER_CLIENT_SECRET': 'bench',
+        'OPENAI_API_KEY': 'sk-bench',
+        # mock 임베딩은 원문 입력을 받으므로 tiktoken 토크나이저 다운로드 생략
+        'EMBEDDING_CHECK_CTX': 'false',
+    }
+
+
+# --- 합성 응답 생성 ---
+
+def synth_locker_response(name, count):
+    """locker_info / locker_realtime_use 형식의 합성 응답 (stlckId 기준으로 서로 매칭)."""
+    rng = random.Random(name)
+    items = []
+    for i in range(count):
+        locker_id = f'LCK{i:05d}'
+        if name == 'locker_info':
+            items.append({
+                'stlckId': locker_id,
+                'stlckRprsPstnNm': f'테스트역 {i}번 보관함',
+                'stlckDtlPstnNm': f'{i % 10 + 1}번 출구 앞',
+                'lat': f'{37.45 + rng.random() * 0.2:.6f}',
+                'lot': f'{126.85 + rng.random() * 0.3:.6f}',
+                'fcltRoadNmAddr': f'서울특별시 중구 세종대로 {i + 1}',
+                'stlckCnt': str(rng.randint(10, 60)),
+                'wkdyOperBgngTm': '053000',
+                'wkdyOperEndTm': '240000',
+            })
+        else:
+            items.append({
+                'stlckId': locker_id,
+                'usePsbltyLrgszStlckCnt': str(rng.randint(0, 10)),
+                'usePsbltyMdmszStlckCnt': str(rng.randint(0, 20)),
+                'usePsbltySmlszStlckCnt': str(rng.randint(0, 30)),
+                'totDt': '20260101120000',
+            })
+    return {
+        'header': {'resultCode': 'K0', 'resultMsg': 'NORMAL SERVICE'},
+        'body': {'pageNo': 1, 'numOfRows': count, 'totalCount': count, 'item': items},
+    }
+
+
+def _interpolate(x1, y1, x2, y2, steps):
+    return [(x1 + (x2 - x1) * t / steps, y1 + (y2 - y1) * t / steps) for t in range(steps + 1)]
+
+
+def synth_pub_trans_path(sx, sy, ex, ey):
+    """도보 - 지하철 - 도보 구성의 searchPubTransPath 합성 응답."""
+    mid = _interpolate(sx, sy, ex, ey, 6)
+    stations = [{'stationName': f'역{i}', 'x': f'{x:.6f}', 'y': f'{y:.6f}'} for i, (x, y) in enumerate(mid[1:-1])]
+    map_obj = f'{sx:.4f}:{sy:.4f}:{ex:.4f}:{ey:.4f}'
+    return {
+        'result': {
+            'path': [{
+                'pathType': 1,
+                'subPath': [
+                    {'trafficType': 3, 'distance': 300},
+                    {
+                        'trafficType': 1,
+                        'lane': [{'name': '수도권 2호선', 'subwayCode': 2, 'mapObj': map_obj}],
+                        'passStopList': {'stations': stations},
+                    },
+                    {'trafficType': 3, 'distance': 200},
+                ],
+                'info': {'mapObj': map_obj},
+            }]
+        }
+    }
+
+
+def synth_load_lane(map_object):
+    """loadLane 합성 응답: mapObject에 담긴 시작/끝 좌표 사이를 촘촘히 보간합니다."""
+    try:
+        sx, sy, ex, ey = (float(v) for v in map_object.split('@')[-1].split(':')[:4])
+    except ValueError:
+        sx, sy, ex, ey = 126.97, 37.55, 127.02, 37.52
+    points = [{'x': x, 'y': y} for x, y in _interpolate(sx, sy, ex, ey, 50)]
+    return {'result': {'lane': [{'class': 2, 'type': 2, 'section': [{'graphPos': points}]}]}}
+
+
+def synth_driving(start, goal):
+    """Naver Directions driving 합성 응답 (path는 [lng, lat] 순서)."""
+    path = [[x, y] for x, y in _interpolate(start[0], start[1], goal[0], goal[1], 80)]
+    return {'code': 0, 'message': 'ok', 'route': {'traoptimal': [{'summary': {}, 'path': path}]}}
+
+
+# 포맷터(FinalResponse 구조화 출력)에 돌려줄 고정 응답
+_FINAL_RESPONSE = {
+    'response': '일정을 완성했습니다. 사이드바를 확인해 주세요!',
+    'planUpdates': [{
+        'action': 'set_activities',
+        'day': 1,
+        'activities': [
+            {'time': '10:00', 'description': '경복궁 방문', 'location': '경복궁', 'lat': 37.5796, 'lng': 126.9770},
+            {'time': '13:00', 'description': '광장시장 점심', 'location': '광장시장', 'lat': 37.5700, 'lng': 126.9996},
+        ],
+    }],
+}
+
+
+def _usage(body, completion_tokens):
+    # 대략적인 토큰 수: 4글자당 1토큰
+    prompt_tokens = max(1, len(json.dumps(body.get('messages', body.get('input', '')), ensure_ascii=False)) // 4)
+    return {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens}
+
+
+def synth_chat_completion(body):
+    """
+    OpenAI chat.completions 합성 응답.
+    - response_format(json_schema) 또는 FinalResponse 함수 강제 호출: 고정 일정 JSON 반환
+    - 도구가 바인딩되어 있고 아직 도구 결과가 없으면: vector_search_tool 1회 호출
+    - 그 외: 도구 호출 없는 일반 응답
+    """
+    messages = body.get('messages', [])
+    tools = body.get('tools') or []
+    tool_choice = body.get('tool_choice')
+    response_format = body.get('response_format') or {}
+    message = {'role': 'assistant', 'content': None, 'refusal': None}
+    finish_reason = 'stop'
+
+    forced_name = None
+    if isinstance(tool_choice, dict):
+        forced_name = tool_choice.get('function', {}).get('name')
+
+    last_user = next((i for i in range(len(messages) - 1, -1, -1) if messages[i].get('role') == 'user'), -1)
+    has_tool_result = any(m.get('role') == 'tool' for m in messages[last_user + 1:])
+
+    if response_format.get('type') == 'json_schema':
+        message['content'] = json.dumps(_FINAL_RESPONSE, ensure_ascii=False)
+    elif forced_name:
+        message['tool_calls'] = [_tool_call(forced_name, _FINAL_RESPONSE)]
+        finish_reason = 'tool_calls'
+    elif tools and not has_tool_result:
+        query = str(messages[last_user].get('content', ''))[-50:] if last_user >= 0 else '서울'
+        message['tool_calls'] = [_tool_call('vector_search_tool', {'query': query})]
+        finish_reason = 'tool_calls'
+    else:
+        message['content'] = '필요한 정보를 모두 수집했습니다.'
+
+    completion = json.dumps(message, ensure_ascii=False)
+    return {
+        'id': 'chatcmpl-mock',
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': body.get('model', 'mock'),
+        'choices': [{'index': 0, 'message': message, 'logprobs': None, 'finish_reason': finish_reason}],
+        'usage': _usage(body, len(completion) // 4),
+    }
+
+
+def _tool_call(name, arguments):
+    call_id = 'call_' + hashlib.md5(f'{name}{time.time_ns()}'.encode()).hexdigest()[:12]
+    return {'id': call_id, 'type': 'function',
+            'function': {'name': name, 'arguments': json.dumps(arguments, ensure_ascii=False)}}
+
+
+def synth_embeddings(body):
+    """입력마다 결정적인(deterministic) 임베딩 벡터를 돌려줍니다. base64 인코딩 요청도 지원."""
+    inputs = body.get('input', [])
+    if not isinstance(inputs, list) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]  # 단일 문자열 또는 단일 토큰 배열
+    dim = int(body.get('dimensions') or EMBEDDING_DIM)
+    data = []
+    for i, item in enumerate(inputs):
+        rng = random.Random(json.dumps(item))
+        vector = [rng.uniform(-1, 1) for _ in range(dim)]
+        if body.get('encoding_format') == 'base64':
+            embedding = base64.b64encode(struct.pack(f'<{dim}f', *vector)).decode('ascii')
+        else:
+            embedding = vector
+        data.append({'object': 'embedding', 'index': i, 'embedding': embedding})
+    return {'object': 'list', 'data': data, 'model': body.get('model', 'mock'), 'usage': _usage(body, 0)}
+
+
+def parse_latency_overrides(values):
+    """['openai=800', 'locker=50'] -> {'openai': 800.0, 'locker': 50.0}"""
+    overrides = {}
+    for value in values or []:
+        name, _, ms = value.partition('=')
+        overrides[name.strip()] = float(ms)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로컬 upstream mock 서버')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='모든 upstream의 기본 응답 지연')
+    parser.add_argument('--latency', action='append', metavar='NAME=MS',
+                        help='upstream별 지연 (locker, odsay, naver, openai 또는 개별 엔드포인트 이름)')
+    parser.add_argument('--fixtures', help='녹화된 응답 JSON 디렉터리')
+    parser.add_argument('--lockers', type=int, default=300, help='합성 보관함 개수')
+    args = parser.parse_args()
+
+    mock = MockUpstream(args.latency_ms, parse_latency_overrides(args.latency), args.fixtures, args.lockers)
+    mock.start(args.port)
+    print(f'Mock upstream listening on {mock.base_url}')
+    for key, value in env_for(mock.base_url).items():
+        print(f'  {key}={value}')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+실제 upstream 응답 녹화
+
+config.py의 키/주소로 data.go.kr, ODsay, Naver 를 한 번씩 호출하여
+mock_upstream.py 가 재생할 수 있는 JSON 파일로 저장합니다.
+(OpenAI 응답은 녹화하지 않고 mock 서버의 합성 응답을 사용합니다.)
+
+    python -m bench.record_fixtures --out bench/fixtures
+"""
+import argparse
+import json
+import os
+
+import requests
+
+from config import (SERVICE_KEY, BASE_URL, STDG_CD, ODSAY_API_KEY, NAVER_MAP_KEY, NAVER_CLIENT_SECRET,
+                    ODSAY_BASE_URL, NAVER_DIRECTIONS_URL)
+from bench.mock_upstream import FIXTURE_FILES
+
+# 서울역 -> 강남역
+SAMPLE_START = (37.5547, 126.9707)
+SAMPLE_END = (37.4979, 127.0276)
+
+
+def _save(out_dir, name, data):
+    path = os.path.join(out_dir, FIXTURE_FILES[name])
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    print(f'  saved {path}')
+
+
+def record(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    locker_params = {'serviceKey': SERVICE_KEY, 'pageNo': 1, 'numOfRows': 500, 'type': 'json', 'stdgCd': STDG_CD}
+    for name in ('locker_info', 'locker_realtime_use'):
+        _save(out_dir, name, requests.get(f'{BASE_URL}/{name}', params=locker_params, timeout=10).json())
+
+    headers = {"Referer": "http://localhost:5000"}
+    path_json = requests.get(f'{ODSAY_BASE_URL}/searchPubTransPath', headers=headers, timeout=10, params={
+        'SX': SAMPLE_START[1], 'SY': SAMPLE_START[0], 'EX': SAMPLE_END[1], 'EY': SAMPLE_END[0],
+        'apiKey': ODSAY_API_KEY, 'SearchPathType': 0,
+    }).json()
+    _save(out_dir, 'searchPubTransPath', path_json)
+
+    # 경로 응답에서 첫 mapObj를 찾아 loadLane 녹화
+    map_obj = ''
+    for path in path_json.get('result', {}).get('path', [])[:1]:
+        map_obj = path.get('info', {}).get('mapObj', '')
+    if map_obj:
+        lane_json = requests.get(f'{ODSAY_BASE_URL}/loadLane', headers=headers, timeout=10, params={
+            'apiKey': ODSAY_API_KEY, 'mapObject': f'0:0@{map_obj}',
+        }).json()
+        _save(out_dir, 'loadLane', lane_json)
+
+    driving_json = requests.get(NAVER_DIRECTIONS_URL, timeout=10, headers={
+        "X-NCP-APIGW-API-KEY-ID": NAVER_MAP_KEY,
+        "X-NCP-APIGW-API-KEY": NAVER_CLIENT_SECRET,
+    }, params={
+        'start': f'{SAMPLE_START[1]},{SAMPLE_START[0]}',
+        'goal': f'{SAMPLE_END[1]},{SAMPLE_END[0]}',
+        'option': 'traoptimal',
+    }).json()
+    _save(out_dir, 'driving', driving_json)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실제 upstream 응답을 fixture로 녹화')
+    parser.add_argument('--out', default=os.path.join(os.path.dirname(__file__), 'fixtures'))
+    args = parser.parse_args()
+    record(args.out)
+
+
+if __name__ == '__main__':
+    main()
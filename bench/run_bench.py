@@ -0,0 +1,220 @@
+"""
+API 벤치마크 / 부하 테스트
+
+로컬 mock upstream 서버(mock_upstream.py)와 Flask 앱을 같은 프로세스에서 띄운 뒤
+`/api/lockers`, `/api/route`, `/api/chat` 에 동시 요청을 보내고
+엔드포인트별 p50/p95/p99 지연, 처리량(req/s), upstream 호출 수를 출력합니다.
+
+    python -m bench.run_bench --requests 200 --concurrency 16 --latency-ms 30 --latency openai=500
+    python -m bench.run_bench --endpoints lockers,lockers_columnar,route --fixtures bench/fixtures --json bench_output.json
+
+이미 떠 있는 앱을 측정하려면 `--target http://127.0.0.1:5000` 을 주고,
+해당 앱이 mock 서버를 바라보고 있다면 `--mock-url` 로 upstream 호출 수도 집계할 수 있습니다.
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from bench.mock_upstream import MockUpstream, env_for, parse_latency_overrides
+
+# 서울 시내 샘플 구간 (start, end, mode, sub_mode)
+ROUTE_SAMPLES = [
+    ('37.5547,126.9707', '37.4979,127.0276', 'transit', None),     # 서울역 -> 강남역
+    ('37.5796,126.9770', '37.5700,126.9996', 'transit', 'subway'),  # 경복궁 -> 광장시장
+    ('37.5512,126.9882', '37.5340,126.9946', 'transit', 'bus'),     # 남산타워 -> 이태원
+    ('37.5665,126.9780', '37.5110,127.0980', 'car', None),          # 시청 -> 잠실
+]
+
+CHAT_SAMPLES = [
+    '2박 3일 서울 여행 일정 짜줘',
+    '경복궁 근처 전통시장 추천해줘',
+    '1일차에 박물관 하나 추가해줘',
+]
+
+
+def lockers_request(i):
+    return 'GET', '/api/lockers', {}
+
+
+def lockers_columnar_request(i):
+    return 'GET', '/api/lockers', {'params': {'format': 'columnar'}}
+
+
+def route_request(i):
+    start, end, mode, sub_mode = ROUTE_SAMPLES[i % len(ROUTE_SAMPLES)]
+    params = {'start': start, 'end': end, 'mode': mode}
+    if sub_mode:
+        params['sub_mode'] = sub_mode
+    return 'GET', '/api/route', {'params': params}
+
+
+def chat_request(i):
+    body = {'message': CHAT_SAMPLES[i % len(CHAT_SAMPLES)], 'tripData': [], 'lang': 'ko'}
+    return 'POST', '/api/chat', {'json': body}
+
+
+ENDPOINTS = {
+    'lockers': lockers_request,
+    'lockers_columnar': lockers_columnar_request,
+    'route': route_request,
+    'chat': chat_request,
+}
+
+
+def percentile(sorted_values, pct):
+    """최근접 순위(nearest-rank) 방식 백분위수."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100.0))  # pct/100*n 순서는 부동소수 오차로 한 칸 밀릴 수 있음
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def run_load(base_url, make_request, total, concurrency, timeout):
+    """total 개의 요청을 concurrency 개 스레드로 보내고 (지연 목록, 에러 수, 응답 크기 목록, 경과 시간)을 반환."""
+    local = threading.local()
+
+    def one(i):
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = local.session = requests.Session()
+        method, path, kwargs = make_request(i)
+        started = time.perf_counter()
+        size = 0
+        try:
+            response = session.request(method, base_url + path, timeout=timeout, **kwargs)
+            # 압축된 경우 Content-Length 가 실제 전송 크기
+            size = int(response.headers.get('Content-Length', len(response.content)))
+            # /api/chat 은 실패해도 200 + success: false 로 응답하므로 본문까지 확인
+            ok = response.status_code < 400 and response.json().get('success', True) is not False
+        except (requests.RequestException, ValueError):
+            ok = False
+        return time.perf_counter() - started, ok, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _, _ in results)
+    errors = sum(1 for _, ok, _ in results if not ok)
+    sizes = [size for _, _, size in results]
+    return latencies, errors, sizes, elapsed
+
+
+def bench_endpoint(name, base_url, args, upstream_counts, reset_counts):
+    make_request = ENDPOINTS[name]
+    if args.warmup:
+        run_load(base_url, make_request, args.warmup, min(args.warmup, args.concurrency), args.timeout)
+    reset_counts()
+
+    total = args.chat_requests if name == 'chat' and args.chat_requests else args.requests
+    latencies, errors, sizes, elapsed = run_load(base_url, make_request, total, args.concurrency, args.timeout)
+    upstream = upstream_counts()
+    return {
+        'endpoint': name,
+        'requests': total,
+        'concurrency': args.concurrency,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        'throughput_rps': total / elapsed if elapsed else 0.0,
+        'response_bytes': statistics.fmean(sizes) if sizes else 0.0,
+        'upstream_calls': upstream,
+        'upstream_calls_per_request': sum(upstream.values()) / total if total else 0.0,
+    }
+
+
+def print_report(results):
+    header = (f"{'endpoint':<18}{'reqs':>7}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'req/s':>9}{'up/req':>8}{'bytes':>10}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['endpoint']:<18}{r['requests']:>7}{r['errors']:>6}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['throughput_rps']:>9.1f}{r['upstream_calls_per_request']:>8.2f}{r['response_bytes']:>10.0f}")
+        if r['upstream_calls']:
+            calls = ', '.join(f'{k}={v}' for k, v in sorted(r['upstream_calls'].items()))
+            print(f"{'':<18}upstream: {calls}")
+
+
+def start_app(mock):
+    """mock 서버를 바라보도록 환경변수를 설정한 뒤 Flask 앱을 띄웁니다."""
+    from werkzeug.serving import make_server
+
+    # config.py는 import 시점에 환경변수를 읽으므로 반드시 app import 전에 설정
+    os.environ.update(env_for(mock.base_url))
+    from app import app
+
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API 벤치마크 / 부하 테스트')
+    parser.add_argument('--endpoints', default='lockers,lockers_columnar,route,chat',
+                        help='쉼표로 구분 (lockers, lockers_columnar, route, chat)')
+    parser.add_argument('--requests', type=int, default=100, help='엔드포인트별 요청 수')
+    parser.add_argument('--chat-requests', type=int, help='chat 엔드포인트 요청 수 (기본값: --requests)')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--warmup', type=int, default=3, help='측정 전 워밍업 요청 수')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='mock upstream 기본 응답 지연')
+    parser.add_argument('--latency', action='append', metavar='NAME=MS',
+                        help='upstream별 지연 (locker, odsay, naver, openai 또는 개별 엔드포인트 이름)')
+    parser.add_argument('--fixtures', help='녹화된 upstream 응답 JSON 디렉터리')
+    parser.add_argument('--lockers', type=int, default=300, help='합성 보관함 개수')
+    parser.add_argument('--target', help='이미 실행 중인 앱 주소 (지정 시 앱/mock 서버를 띄우지 않음)')
+    parser.add_argument('--mock-url', help='--target 사용 시 upstream 호출 수를 조회할 mock 서버 주소')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)  # 요청별 access log 숨김
+
+    names = [n.strip() for n in args.endpoints.split(',') if n.strip()]
+    unknown = [n for n in names if n not in ENDPOINTS]
+    if unknown:
+        parser.error(f'알 수 없는 엔드포인트: {", ".join(unknown)}')
+
+    mock = server = None
+    if args.target:
+        base_url = args.target.rstrip('/')
+        if args.mock_url:
+            mock_url = args.mock_url.rstrip('/')
+            upstream_counts = lambda: requests.get(f'{mock_url}/_mock/stats', timeout=5).json()
+            reset_counts = lambda: requests.post(f'{mock_url}/_mock/reset', timeout=5)
+        else:
+            upstream_counts, reset_counts = dict, lambda: None
+    else:
+        mock = MockUpstream(args.latency_ms, parse_latency_overrides(args.latency), args.fixtures, args.lockers)
+        mock.start()
+        server, base_url = start_app(mock)
+        upstream_counts, reset_counts = mock.counts, mock.reset
+
+    try:
+        results = [bench_endpoint(name, base_url, args, upstream_counts, reset_counts) for name in names]
+    finally:
+        if server:
+            server.shutdown()
+        if mock:
+            mock.stop()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
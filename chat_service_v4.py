@@ -1,15 +1,20 @@
 import json
+import logging
 import operator
 from typing import Annotated, List, Optional, TypedDict
 from langchain_openai import ChatOpenAI
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.prebuilt import ToolNode
 
-from config import OPENAI_API_KEY, SYSTEM_INSTRUCTION
+from config import OPENAI_API_KEY, OPENAI_BASE_URL, SYSTEM_INSTRUCTION
 from tool import tools
 from schema import FinalResponse
+from metrics import span, timed, record_tokens
+
+logger = logging.getLogger(__name__)
 
 # --- 1. 상태 정의 ---
 class AgentState(TypedDict):
@@ -19,13 +24,28 @@ class AgentState(TypedDict):
     retry_count: int
 
 # --- 2. 모델 설정 ---
-mini_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key=OPENAI_API_KEY).bind_tools(tools)
-pro_llm = ChatOpenAI(model="gpt-4o", temperature=0.3, api_key=OPENAI_API_KEY).with_structured_output(FinalResponse)
+class TokenUsageHandler(BaseCallbackHandler):
+    """LLM 호출마다 토큰 사용량을 metrics에 기록합니다."""
+    def on_llm_end(self, response, **kwargs):
+        model = (response.llm_output or {}).get("model_name", "unknown")
+        for generations in response.generations:
+            for gen in generations:
+                usage = getattr(getattr(gen, "message", None), "usage_metadata", None)
+                if usage:
+                    record_tokens(model, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+
+token_usage_handler = TokenUsageHandler()
+
+mini_llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL,
+                      callbacks=[token_usage_handler]).bind_tools(tools)
+pro_llm = ChatOpenAI(model="gpt-4o", temperature=0.3, api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL,
+                     callbacks=[token_usage_handler]).with_structured_output(FinalResponse)
 
 # --- 3. 노드 구현 ---
 
 # chat_service_v4.py 최종 수정본
 
+@timed("node", "researcher")
 def researcher_node(state: AgentState):
 
     """[Researcher] 모든 날짜의 일정에 필요한 도구를 다 사용했는지 검토합니다."""
@@ -73,18 +93,20 @@ def researcher_node(state: AgentState):
     모든 날짜의 경로 데이터가 수집될 때까지 포맷터로 넘어가지 마세요.
                                """)
     search_count = state.get("search_count", 0)
-    print(f"\n🤖 [Researcher Node] 탐색 차수: {search_count + 1}")
+    logger.debug("🤖 [Researcher Node] 탐색 차수: %d", search_count + 1)
 
-    response = mini_llm.invoke([system_msg] + input_messages)
+    with span("llm", "gpt-4o-mini"):
+        response = mini_llm.invoke([system_msg] + input_messages)
 
     if response.tool_calls:
         for tool in response.tool_calls:
-            print(f"   🛠️ 호출 도구: {tool['name']}")
+            logger.debug("   🛠️ 호출 도구: %s", tool['name'])
     else:
-        print("   ✅ 도구 호출 없이 포맷터로 이동 준비 완료")
+        logger.debug("   ✅ 도구 호출 없이 포맷터로 이동 준비 완료")
 
     return {"messages": [response]}
 
+@timed("node", "formatter")
 def formatter_node(state: AgentState):
     """[Formatter] trip_context를 안전하게 전달하고 최종 JSON 생성"""
     # trip_context가 리스트이므로 안전하게 처리
@@ -120,18 +142,20 @@ def formatter_node(state: AgentState):
     # 포맷터는 도구 호출 과정이 필요 없으므로 깨끗한 메시지만 전달 (400 에러 방지)
     clean_messages = [m for m in state["messages"] if isinstance(m, (HumanMessage, AIMessage)) and not getattr(m, 'tool_calls', None)]
     
-    response = pro_llm.invoke([SystemMessage(content=prompt)] + clean_messages[-3:])
+    with span("llm", "gpt-4o"):
+        response = pro_llm.invoke([SystemMessage(content=prompt)] + clean_messages[-3:])
 
     # response = pro_llm.invoke([SystemMessage(content=prompt)] + state["messages"][-3:])
     final_data = response.dict()
 
-    print("\n📦 [Final Formatter Output]")
-    for up in final_data.get("planUpdates", []):
-        day = up.get("day")
-        # activities 중 transport 필드가 JSON 형태인지 체크
-        acts = up.get("activities", [])
-        has_route = any("{" in str(a.get("transport", "")) for a in acts)
-        print(f"   📅 {day}일차 일정: {'✅ 경로 포함' if has_route else '❌ 경로 누락'}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("📦 [Final Formatter Output]")
+        for up in final_data.get("planUpdates", []):
+            day = up.get("day")
+            # activities 중 transport 필드가 JSON 형태인지 체크
+            acts = up.get("activities") or []
+            has_route = any("{" in str(a.get("transport", "")) for a in acts)
+            logger.debug("   📅 %s일차 일정: %s", day, '✅ 경로 포함' if has_route else '❌ 경로 누락')
     return {"final_json": response.dict(), "retry_count": state.get("retry_count", 0) + 1}
 
 # --- 4. 검증 및 그래프 구축 ---
@@ -174,15 +198,15 @@ def handle_chat(user_message, trip_context, lang='ko'):
                 if "final_json" in state:
                     final_result = state["final_json"]
     except Exception as e:
-        print(f"Graph Error: {e}")
+        logger.exception("Graph Error: %s", e)
         return {'success': False, 'response': "에러가 발생했습니다.", 'planUpdates': []}
 
     if not final_result:
         return {'success': False, 'response': "응답을 생성하지 못했습니다.", 'planUpdates': []}
 
     # index.html이 기대하는 success, response, planUpdates 필드를 정확히 반환
-    print(f"--- [DEBUG] AI Final Response ---")
-    print(json.dumps(final_result, indent=2, ensure_ascii=False))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("--- AI Final Response ---\n%s", json.dumps(final_result, indent=2, ensure_ascii=False))
 
     return {
         'success': True, 
@@ -0,0 +1,77 @@
+"""
+JSON API 응답 압축 (Accept-Encoding 협상)
+
+brotli 패키지가 설치되어 있으면 br을 우선 사용하고, 없으면 gzip으로 압축합니다.
+"""
+import gzip
+
+from flask import request
+
+from metrics import span
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+MIN_SIZE = 500         # 이보다 작은 응답은 압축 이득이 없으므로 그대로 전송
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5     # 실시간 응답용 (11은 너무 느림)
+
+
+def _accepted_encodings(header):
+    """'gzip, br;q=0.8, *;q=0' -> {'gzip': 1.0, 'br': 0.8, '*': 0.0}"""
+    encodings = {}
+    for part in header.split(','):
+        name, *params = part.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+def _choose_encoding(header):
+    """지원하는 인코딩 중 q 값이 가장 높은 것 (같으면 br 우선)"""
+    accepted = _accepted_encodings(header)
+    wildcard = accepted.get('*', 0.0)
+    supported = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = max(supported, key=lambda name: accepted.get(name, wildcard))
+    return best if accepted.get(best, wildcard) > 0 else None
+
+
+def init_app(app):
+    """JSON 응답에 gzip/brotli 압축을 적용하는 after_request 훅을 등록합니다."""
+
+    @app.after_request
+    def _compress(response):
+        if (response.mimetype != 'application/json' or response.direct_passthrough
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < MIN_SIZE:
+            return response
+
+        encoding = _choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        with span('response', encoding):
+            if encoding == 'br':
+                data = brotli.compress(data, quality=BROTLI_QUALITY)
+            else:
+                data = gzip.compress(data, compresslevel=GZIP_LEVEL)
+        response.set_data(data)
+        response.headers['Content-Encoding'] = encoding
+        return response
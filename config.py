@@ -6,13 +6,24 @@ load_dotenv()
 
 # API 설정
 SERVICE_KEY = os.getenv('SERVICE_KEY', '')
-BASE_URL = 'https://apis.data.go.kr/B551982/psl'
+BASE_URL = os.getenv('LOCKER_BASE_URL', 'https://apis.data.go.kr/B551982/psl')
 STDG_CD = '1100000000'  # 서울
+LOCKER_STATIC_TTL = int(os.getenv('LOCKER_STATIC_TTL', '3600'))  # 보관함 정적 정보(locker_info) 캐시 시간(초)
 NAVER_MAP_KEY = os.getenv('NAVER_MAP_KEY', '')
 NAVER_CLIENT_SECRET = os.getenv('NAVER_CLIENT_SECRET', '')
 ODSAY_API_KEY = os.getenv('ODSAY_API_KEY', '').strip('"').strip("'")
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 
+# Upstream 주소 (벤치마크 시 bench/mock_upstream.py 의 로컬 mock 서버로 교체)
+ODSAY_BASE_URL = os.getenv('ODSAY_BASE_URL', 'https://api.odsay.com/v1/api')
+NAVER_DIRECTIONS_URL = os.getenv('NAVER_DIRECTIONS_URL', 'https://maps.apigw.ntruss.com/map-direction/v1/driving')
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None  # None이면 OpenAI 기본 주소 사용
+# 임베딩 입력 토큰 길이 검사/분할 (tiktoken 필요). 벤치마크 mock 서버에서만 false로 끔
+EMBEDDING_CHECK_CTX = os.getenv('EMBEDDING_CHECK_CTX', 'true').lower() not in ('0', 'false', 'no')
+
+# 로그 레벨 (DEBUG로 설정하면 그래프 노드/RAG 검색 상세 로그 출력)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING').upper()
+
 # OpenAI 시스템 프롬프트
 SYSTEM_INSTRUCTION = """
 당신은 사용자의 서울 여행을 돕는 '서울 여행 플래너' 에이전트입니다. 
@@ -0,0 +1,180 @@
+"""
+Hot-path 계측
+
+- span(): 그래프 노드, 도구 호출, Chroma 검색, 임베딩, upstream HTTP 요청 등 구간별 소요 시간
+- record_tokens(): LLM 호출별 토큰 사용량
+- record_cache(): 캐시 hit/miss
+모두 프로세스 메모리에 누적되며 `/metrics` 에서 Prometheus 텍스트 형식으로 노출됩니다.
+
+요청에 `?profile=1` 또는 `X-Profile: 1` 헤더를 주면 해당 요청에서 기록된 span 목록을
+JSON 응답의 `profile` 필드와 `Server-Timing` 헤더로 돌려줍니다.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import current_app, g, request
+
+PREFIX = 'planner_'
+
+# 히스토그램 버킷 (초)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 메트릭 이름 -> (타입, 설명)
+METRICS = {
+    'span_seconds': ('histogram', 'Hot-path span duration by kind (node, tool, llm, chroma, embedding, upstream, response)'),
+    'http_request_seconds': ('histogram', 'Flask request duration by endpoint'),
+    'http_requests_total': ('counter', 'Flask requests by endpoint and status'),
+    'upstream_requests_total': ('counter', 'Upstream HTTP requests by upstream and status'),
+    'llm_tokens_total': ('counter', 'LLM tokens by model and type (prompt, completion)'),
+    'cache_requests_total': ('counter', 'Cache lookups by cache and result (hit, miss)'),
+}
+
+_lock = threading.Lock()
+_histograms = {}  # (metric, labels) -> [bucket별 누적 개수..., sum, count]
+_counters = {}    # (metric, labels) -> value
+
+# 현재 요청의 profile span 목록 (profile 모드가 아니면 None)
+_profile_spans = ContextVar('profile_spans', default=None)
+
+
+def _key(metric, labels):
+    return metric, tuple(sorted(labels.items()))
+
+
+def observe(metric, seconds, **labels):
+    key = _key(metric, labels)
+    with _lock:
+        values = _histograms.get(key)
+        if values is None:
+            values = _histograms[key] = [0] * len(BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                values[i] += 1
+        values[-2] += seconds
+        values[-1] += 1
+
+
+def inc(metric, value=1, **labels):
+    key = _key(metric, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def record_tokens(model, prompt_tokens, completion_tokens):
+    inc('llm_tokens_total', prompt_tokens, model=model, type='prompt')
+    inc('llm_tokens_total', completion_tokens, model=model, type='completion')
+
+
+def record_cache(cache, hit):
+    inc('cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+@contextmanager
+def span(kind, name):
+    """with 블록의 소요 시간을 기록합니다. profile 모드 요청이면 응답용 목록에도 추가합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        observe('span_seconds', elapsed, kind=kind, name=name)
+        spans = _profile_spans.get()
+        if spans is not None:
+            spans.append((kind, name, elapsed))
+
+
+def timed(kind, name):
+    """함수 전체를 span으로 감싸는 데코레이터 (그래프 노드, 도구 함수용)."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(kind, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# --- Prometheus 텍스트 출력 ---
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def render():
+    with _lock:
+        histograms = {k: list(v) for k, v in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = []
+    for metric, (metric_type, help_text) in METRICS.items():
+        name = PREFIX + metric
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        if metric_type == 'counter':
+            for (m, labels), value in sorted(counters.items()):
+                if m == metric:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+        else:
+            for (m, labels), values in sorted(histograms.items()):
+                if m != metric:
+                    continue
+                for bound, count in zip(BUCKETS, values):
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {values[-1]}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {values[-2]}')
+                lines.append(f'{name}_count{_format_labels(labels)} {values[-1]}')
+    return '\n'.join(lines) + '\n'
+
+
+# --- Flask 연동 ---
+
+def _profile_requested():
+    return request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+
+
+def init_app(app):
+    """요청별 소요 시간 기록 및 profile 모드 훅을 등록합니다."""
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_started = time.perf_counter()
+        if _profile_requested():
+            g.profile_token = _profile_spans.set([])
+
+    @app.after_request
+    def _record_request(response):
+        elapsed = time.perf_counter() - g.get('metrics_started', time.perf_counter())
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        observe('http_request_seconds', elapsed, endpoint=endpoint, method=request.method)
+        inc('http_requests_total', endpoint=endpoint, method=request.method, status=str(response.status_code))
+
+        spans = _profile_spans.get()
+        if spans is not None:
+            _attach_profile(response, spans, elapsed)
+        return response
+
+    @app.teardown_request
+    def _reset_profile(exc):
+        token = g.pop('profile_token', None)
+        if token is not None:
+            _profile_spans.reset(token)
+
+
+def _attach_profile(response, spans, total):
+    timings = [{'kind': kind, 'name': name, 'ms': round(seconds * 1000, 2)} for kind, name, seconds in spans]
+    server_timing = [f'total;dur={total * 1000:.2f}']
+    server_timing += [f'{t["kind"]};desc="{t["name"]}";dur={t["ms"]}' for t in timings]
+    response.headers['Server-Timing'] = ', '.join(server_timing)
+
+    if response.is_json and not response.direct_passthrough:
+        data = response.get_json(silent=True)
+        if isinstance(data, dict):
+            data['profile'] = {'total_ms': round(total * 1000, 2), 'spans': timings}
+            response.set_data(current_app.json.dumps(data))
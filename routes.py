@@ -1,5 +1,5 @@
-from flask import jsonify, render_template, request
-from services import get_lockers, get_route
+from flask import Response, jsonify, render_template, request
+from services import get_lockers, get_locker_static, get_route
 # try:
 #     # Prefer new agent-based service when available
 from chat_service_v4 import handle_chat
@@ -7,6 +7,7 @@ from chat_service_v4 import handle_chat
 #     # Fallback to legacy implementation
 
 from config import NAVER_MAP_KEY
+import metrics
 
 def register_routes(app):
     @app.route('/')
@@ -27,7 +28,15 @@ def register_routes(app):
 
     @app.route('/api/lockers')
     def lockers_api():
-        result = get_lockers()
+        columnar = request.args.get('format') == 'columnar' # parallel arrays instead of per-locker objects
+        result = get_lockers(columnar)
+        if isinstance(result, tuple):  # error case
+            return jsonify(result[0]), result[1]
+        return jsonify(result)
+
+    @app.route('/api/lockers/static')
+    def lockers_static_api():
+        result = get_locker_static()
         if isinstance(result, tuple):  # error case
             return jsonify(result[0]), result[1]
         return jsonify(result)
@@ -40,4 +49,8 @@ def register_routes(app):
 
         lang = data.get('lang', 'ko')
         result = handle_chat(user_message, trip_context, lang)
-        return jsonify(result)
\ No newline at end of file
+        return jsonify(result)
+
+    @app.route('/metrics')
+    def metrics_api():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
@@ -1,85 +1,198 @@
+import hashlib
+import logging
+import threading
+import time
+from array import array
 import requests
 import json
-from config import SERVICE_KEY, BASE_URL, STDG_CD, ODSAY_API_KEY, NAVER_MAP_KEY, NAVER_CLIENT_SECRET
+from metrics import span, inc, record_cache
+from config import (SERVICE_KEY, BASE_URL, STDG_CD, ODSAY_API_KEY, NAVER_MAP_KEY, NAVER_CLIENT_SECRET,
+                    ODSAY_BASE_URL, NAVER_DIRECTIONS_URL, LOCKER_STATIC_TTL)
 
-def get_lockers():
-    """물품보관함 정보 + 실시간 현황 통합 API"""
+logger = logging.getLogger(__name__)
+
+def _upstream_get(name, url, **kwargs):
+    """upstream GET 요청 (소요 시간 및 상태 코드 계측)"""
+    status = 'error'
+    try:
+        with span('upstream', name):
+            response = requests.get(url, **kwargs)
+        status = str(response.status_code)
+        return response
+    finally:
+        inc('upstream_requests_total', upstream=name, status=status)
+
+# 위치/주소/운영시간 등 정적 정보는 자주 바뀌지 않으므로 LOCKER_STATIC_TTL 동안 재사용
+_static_lock = threading.Lock()
+_static_table = None
+_static_expires = 0.0
+# locker_info를 다시 받아도 없던 실시간 id (같은 id로는 재조회하지 않음)
+_orphan_ids = frozenset()
+
+def _fetch_locker_items(endpoint):
+    """data.go.kr 물품보관함 API 호출 (locker_info / locker_realtime_use)"""
+    response = _upstream_get(
+        endpoint,
+        f'{BASE_URL}/{endpoint}',
+        params={
+            'serviceKey': SERVICE_KEY,
+            'pageNo': 1,
+            'numOfRows': 500,
+            'type': 'json',
+            'stdgCd': STDG_CD
+        },
+        timeout=10
+    )
+    data = response.json()
+    if data.get('header', {}).get('resultCode') != 'K0':
+        raise ValueError('API 응답 오류')
+    return data.get('body', {}).get('item', [])
+
+def _format_hours(begin, end):
+    return f"{begin[:2]}:{begin[2:4]} - {end[:2]}:{end[2:4]}"
+
+def _build_static_table(info_items):
+    """locker_info 항목을 컬럼 단위 배열로 변환합니다. (숫자 컬럼은 typed array)"""
+    ids = [info['stlckId'] for info in info_items]
+    version = hashlib.md5(json.dumps(info_items, sort_keys=True).encode()).hexdigest()[:12]
+    return {
+        'version': version,
+        'ids': ids,
+        'index': {locker_id: i for i, locker_id in enumerate(ids)},
+        'lat': array('d', (float(info.get('lat', 0)) for info in info_items)),
+        'lng': array('d', (float(info.get('lot', 0)) for info in info_items)),
+        'name': [info.get('stlckRprsPstnNm', '') for info in info_items],
+        'detail': [info.get('stlckDtlPstnNm', '') for info in info_items],
+        'address': [info.get('fcltRoadNmAddr', '') for info in info_items],
+        'totalCount': array('i', (int(info.get('stlckCnt', 0)) for info in info_items)),
+        'operatingHours': [_format_hours(info.get('wkdyOperBgngTm', ''), info.get('wkdyOperEndTm', ''))
+                           for info in info_items],
+    }
+
+def _get_static_table():
+    global _static_table, _static_expires
+    with _static_lock:
+        hit = _static_table is not None and time.monotonic() < _static_expires
+        record_cache('locker_static', hit)
+        if not hit:
+            _static_table = _build_static_table(_fetch_locker_items('locker_info'))
+            _static_expires = time.monotonic() + LOCKER_STATIC_TTL
+        return _static_table
+
+def _refresh_static_for(realtime_ids):
+    """
+    정적 정보에 없는 실시간 id가 새로 보이면 같은 요청 안에서 locker_info를 한 번 다시 받습니다.
+    다시 받아도 없는 id(orphan)는 기억해 두고, 이후에는 TTL이 지날 때까지 건너뜁니다.
+    """
+    global _static_table, _static_expires, _orphan_ids
+    with _static_lock:
+        missing = realtime_ids - _static_table['index'].keys()
+        if missing and not missing <= _orphan_ids:
+            record_cache('locker_static', False)
+            _static_table = _build_static_table(_fetch_locker_items('locker_info'))
+            _static_expires = time.monotonic() + LOCKER_STATIC_TTL
+            _orphan_ids = frozenset(missing - _static_table['index'].keys())
+        return _static_table
+
+def _build_snapshot():
+    """정적 정보 테이블 + 실시간 현황을 stlckId 순서에 맞춘 typed array로 통합"""
+    static = _get_static_table()
+    realtime_items = _fetch_locker_items('locker_realtime_use')
+
+    realtime_ids = {item['stlckId'] for item in realtime_items}
+    if not realtime_ids <= static['index'].keys():
+        # 새 보관함이 생긴 경우: 갱신된 정적 정보로 스냅샷을 만들어야 staticVersion이 /static 응답과 일치
+        static = _refresh_static_for(realtime_ids)
+
+    count = len(static['ids'])
+    large = array('i', [0]) * count
+    medium = array('i', [0]) * count
+    small = array('i', [0]) * count
+    update_time = [''] * count
+
+    index = static['index']
+    for item in realtime_items:
+        i = index.get(item['stlckId'])
+        if i is None:  # locker_info에 없는 보관함은 건너뜀
+            continue
+        large[i] = int(item.get('usePsbltyLrgszStlckCnt', 0))
+        medium[i] = int(item.get('usePsbltyMdmszStlckCnt', 0))
+        small[i] = int(item.get('usePsbltySmlszStlckCnt', 0))
+        update_time[i] = item.get('totDt', '')
+
+    return {'static': static, 'large': large, 'medium': medium, 'small': small, 'updateTime': update_time}
+
+def get_lockers(columnar=False):
+    """물품보관함 정보 + 실시간 현황 통합 API (columnar=True이면 컬럼 단위 배열로 반환)"""
     try:
-        # 1. 위치 정보 가져오기
-        info_response = requests.get(
-            f'{BASE_URL}/locker_info',
-            params={
-                'serviceKey': SERVICE_KEY,
-                'pageNo': 1,
-                'numOfRows': 500,
-                'type': 'json',
-                'stdgCd': STDG_CD
-            },
-            timeout=10
-        )
-        info_data = info_response.json()
-
-        # 2. 실시간 현황 가져오기
-        realtime_response = requests.get(
-            f'{BASE_URL}/locker_realtime_use',
-            params={
-                'serviceKey': SERVICE_KEY,
-                'pageNo': 1,
-                'numOfRows': 500,
-                'type': 'json',
-                'stdgCd': STDG_CD
-            },
-            timeout=10
-        )
-        realtime_data = realtime_response.json()
-
-        # 3. 데이터 통합
-        if (info_data.get('header', {}).get('resultCode') != 'K0' or
-            realtime_data.get('header', {}).get('resultCode') != 'K0'):
-            return {'error': 'API 응답 오류'}, 500
-
-        info_items = info_data.get('body', {}).get('item', [])
-        realtime_items = realtime_data.get('body', {}).get('item', [])
-
-        # stlckId를 키로 하는 딕셔너리 생성
-        realtime_dict = {item['stlckId']: item for item in realtime_items}
-
-        # 통합 데이터 생성
-        lockers = []
-        for info in info_items:
-            locker_id = info['stlckId']
-            realtime = realtime_dict.get(locker_id, {})
-
-            lockers.append({
-                'id': locker_id,
-                'name': info.get('stlckRprsPstnNm', ''),
-                'detail': info.get('stlckDtlPstnNm', ''),
-                'lat': float(info.get('lat', 0)),
-                'lng': float(info.get('lot', 0)),
-                'address': info.get('fcltRoadNmAddr', ''),
-                'large': {
-                    'available': int(realtime.get('usePsbltyLrgszStlckCnt', 0))
-                },
-                'medium': {
-                    'available': int(realtime.get('usePsbltyMdmszStlckCnt', 0))
-                },
-                'small': {
-                    'available': int(realtime.get('usePsbltySmlszStlckCnt', 0))
-                },
-                'totalCount': int(info.get('stlckCnt', 0)),
-                'operatingHours': f"{info.get('wkdyOperBgngTm', '')[:2]}:{info.get('wkdyOperBgngTm', '')[2:4]} - {info.get('wkdyOperEndTm', '')[:2]}:{info.get('wkdyOperEndTm', '')[2:4]}",
-                'updateTime': realtime.get('totDt', '')
-            })
+        snapshot = _build_snapshot()
+    except Exception as e:
+        return {'error': str(e)}, 500
 
+    static = snapshot['static']
+    if columnar:
+        # 이름/주소 등 정적 정보는 get_locker_static()으로 한 번만 받고, staticVersion이 바뀌면 다시 받음
         return {
             'success': True,
-            'count': len(lockers),
-            'lockers': lockers
+            'format': 'columnar',
+            'count': len(static['ids']),
+            'staticVersion': static['version'],
+            'ids': static['ids'],
+            'lat': static['lat'].tolist(),
+            'lng': static['lng'].tolist(),
+            'large': snapshot['large'].tolist(),
+            'medium': snapshot['medium'].tolist(),
+            'small': snapshot['small'].tolist(),
+            'updateTime': max(snapshot['updateTime'], default='')
         }
 
+    # 기존 응답 형식 (보관함별 객체)
+    lockers = [
+        {
+            'id': locker_id,
+            'name': name,
+            'detail': detail,
+            'lat': lat,
+            'lng': lng,
+            'address': address,
+            'large': {'available': large},
+            'medium': {'available': medium},
+            'small': {'available': small},
+            'totalCount': total_count,
+            'operatingHours': operating_hours,
+            'updateTime': update_time
+        }
+        for locker_id, name, detail, lat, lng, address, large, medium, small, total_count, operating_hours, update_time
+        in zip(static['ids'], static['name'], static['detail'], static['lat'], static['lng'], static['address'],
+               snapshot['large'], snapshot['medium'], snapshot['small'], static['totalCount'],
+               static['operatingHours'], snapshot['updateTime'])
+    ]
+
+    return {
+        'success': True,
+        'count': len(lockers),
+        'lockers': lockers
+    }
+
+def get_locker_static():
+    """보관함 정적 정보 테이블 (이름, 상세 위치, 주소, 총 칸 수, 운영시간) - columnar 응답과 ids 순서가 같음"""
+    try:
+        static = _get_static_table()
     except Exception as e:
         return {'error': str(e)}, 500
 
+    return {
+        'success': True,
+        'version': static['version'],
+        'count': len(static['ids']),
+        'ids': static['ids'],
+        'name': static['name'],
+        'detail': static['detail'],
+        'address': static['address'],
+        'totalCount': static['totalCount'].tolist(),
+        'operatingHours': static['operatingHours']
+    }
+
 def get_route(start, end, mode, sub_mode):
     if not start or not end:
         return {'error': 'Missing start or end coordinates'}, 400
@@ -101,7 +214,7 @@ def get_route(start, end, mode, sub_mode):
                 path_type = 2
 
             # ODsay SearchPubTransPath (Standard)
-            url = "https://api.odsay.com/v1/api/searchPubTransPath"
+            url = f"{ODSAY_BASE_URL}/searchPubTransPath"
             params = {
                 "SX": start_lng,
                 "SY": start_lat,
@@ -112,7 +225,7 @@ def get_route(start, end, mode, sub_mode):
             }
 
             headers = {"Referer": "http://localhost:5000"}
-            response = requests.get(url, params=params, headers=headers)
+            response = _upstream_get('searchPubTransPath', url, params=params, headers=headers)
             if response.status_code == 200:
                 res_json = response.json()
                 if 'result' in res_json and 'path' in res_json['result']:
@@ -148,9 +261,9 @@ def get_route(start, end, mode, sub_mode):
                                 map_obj = lane.get('mapObj', '')
                                 if map_obj:
                                     clean_map_obj = map_obj if '@' in map_obj else f"0:0@{map_obj}"
-                                    lane_url = "https://api.odsay.com/v1/api/loadLane"
+                                    lane_url = f"{ODSAY_BASE_URL}/loadLane"
                                     lane_params = {"apiKey": ODSAY_API_KEY, "mapObject": clean_map_obj}
-                                    lane_res = requests.get(lane_url, params=lane_params, headers=headers)
+                                    lane_res = _upstream_get('loadLane', lane_url, params=lane_params, headers=headers)
                                     if lane_res.status_code == 200:
                                         lane_json = lane_res.json()
                                         for l in lane_json.get('result', {}).get('lane', []):
@@ -191,7 +304,7 @@ def get_route(start, end, mode, sub_mode):
 
             # If ODsay failed or no path found, fallback will happen below
             if not path_data:
-                print("ODsay API failed or no path found, Falling back to Driving API")
+                logger.warning("ODsay API failed or no path found, Falling back to Driving API")
 
         # CAR MODE (Naver Directions API) or fallback for transit
         if not path_data:
@@ -204,14 +317,14 @@ def get_route(start, end, mode, sub_mode):
                     "X-NCP-APIGW-API-KEY": client_secret
                 }
 
-                url = "https://maps.apigw.ntruss.com/map-direction/v1/driving"
+                url = NAVER_DIRECTIONS_URL
                 params = {
                     "start": f"{start_lng},{start_lat}", # lng,lat
                     "goal": f"{end_lng},{end_lat}",     # lng,lat
                     "option": "traoptimal"
                 }
 
-                response = requests.get(url, headers=headers, params=params)
+                response = _upstream_get('driving', url, headers=headers, params=params)
 
                 if response.status_code == 200:
                     res_json = response.json()
@@ -229,5 +342,5 @@ def get_route(start, end, mode, sub_mode):
             'mode': mode
         }
     except Exception as e:
-        print(f"Routing Error: {e}")
+        logger.exception("Routing Error: %s", e)
         return {'error': str(e)}, 500
\ No newline at end of file
@@ -1,9 +1,15 @@
 import json
+import logging
 import requests
 from langchain_openai import OpenAIEmbeddings
 from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
 from langchain_core.tools import tool
 from services import get_route, get_lockers
+from config import OPENAI_API_KEY, OPENAI_BASE_URL, EMBEDDING_CHECK_CTX
+from metrics import span, timed
+
+logger = logging.getLogger(__name__)
 
 # # --- 벡터 DB 및 리트리버 설정 ---
 # embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
@@ -11,7 +17,22 @@ from services import get_route, get_lockers
 # retriever = vectorstore.as_retriever(search_kwargs={"k": 5})
 
 # --- 1. 벡터 DB 및 리트리버 설정 ---
-embedding_model = OpenAIEmbeddings(model="text-embedding-3-small")
+class TimedEmbeddings(Embeddings):
+    """임베딩 호출 소요 시간을 계측하는 래퍼"""
+    def __init__(self, inner):
+        self.inner = inner
+
+    def embed_documents(self, texts):
+        with span("embedding", "documents"):
+            return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        with span("embedding", "query"):
+            return self.inner.embed_query(text)
+
+embedding_model = TimedEmbeddings(OpenAIEmbeddings(
+    model="text-embedding-3-small", api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL,
+    check_embedding_ctx_length=EMBEDDING_CHECK_CTX))
 vectorstore = Chroma(embedding_function=embedding_model, persist_directory="./tour_db")
 
 # --- 2. [신규] RAG 데이터 전처리 함수 ---
@@ -36,6 +57,7 @@ def process_rag_docs(docs):
 # --- 3. [신규] 카테고리별 세분화 도구 ---
 
 @tool
+@timed("tool", "attraction_search_tool")
 def attraction_search_tool(query: str):
     """서울의 박물관, 미술관, 테마 거리, 관광 명소 정보를 검색합니다."""
     # museum_art와 tourism_street 카테고리 필터링
@@ -43,21 +65,29 @@ def attraction_search_tool(query: str):
         "k": 5, 
         "filter": {"category": {"$in": ["museum_art", "tourism_street"]}}
     })
-    return process_rag_docs(retriever.invoke(query))
+    with span("chroma", "attraction"):
+        docs = retriever.invoke(query)
+    return process_rag_docs(docs)
 
 @tool
+@timed("tool", "market_search_tool")
 def market_search_tool(query: str):
     """서울의 전통시장, 맛집 골목 정보를 검색합니다."""
     # traditional_market 카테고리 필터링
     retriever = vectorstore.as_retriever(search_kwargs={"k": 5, "filter": {"category": "traditional_market"}})
-    return process_rag_docs(retriever.invoke(query))
+    with span("chroma", "market"):
+        docs = retriever.invoke(query)
+    return process_rag_docs(docs)
 
 @tool
+@timed("tool", "station_search_tool")
 def station_search_tool(query: str):
     """서울 및 수도권 지하철역의 위치 정보를 검색합니다."""
     # subway_station 카테고리 필터링
     retriever = vectorstore.as_retriever(search_kwargs={"k": 3, "filter": {"category": "subway_station"}})
-    return process_rag_docs(retriever.invoke(query))
+    with span("chroma", "station"):
+        docs = retriever.invoke(query)
+    return process_rag_docs(docs)
 
 # @tool
 # def convenience_search_tool(query: str):
@@ -70,14 +100,15 @@ def station_search_tool(query: str):
 #     return process_rag_docs(retriever.invoke(query))
 
 @tool
+@timed("tool", "vector_search_tool")
 def vector_search_tool(query: str):
     """서울 관광지 정보, 맛집, 이용 시간 및 API 명세 문서를 검색합니다."""
     retriever = vectorstore.as_retriever(search_kwargs={
         "k": 5, "filter": {"category": {"$in": ["museum_art", "tourism_street","traditional_market"]}}})
-    docs = retriever.invoke(query)
+    with span("chroma", "vector"):
+        docs = retriever.invoke(query)
     
-    # 디버깅용 로그: 유니코드 깨짐 방지를 위해 직접 한글로 출력 시도
-    print(f"\n🔍 [RAG 검색 쿼리]: {query}")
+    logger.debug("🔍 [RAG 검색 쿼리]: %s", query)
     
     cleaned_results = []
     for i, d in enumerate(docs):
@@ -94,7 +125,7 @@ def vector_search_tool(query: str):
         # 검색 결과 1개당 약 500자 정도로 제한하는 것이 효율적입니다.
         summarized_content = content[:500] 
         
-        print(f"   - 검색 결과 {i+1} (정제됨): {summarized_content[:30]}...")
+        logger.debug("   - 검색 결과 %d (정제됨): %s...", i + 1, summarized_content[:30])
         
         cleaned_results.append({
             "content": summarized_content,